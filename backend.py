@@ -1,195 +1,348 @@
 import sqlite3
+import sys
+import threading
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Callable
 
-def calculate_burns_score(responses):
-    """
-    Calculate total score from array of 25 responses
-    Each response should be between 0-4
-    """
-    if len(responses) != 25:
-        raise ValueError("Must provide exactly 25 responses")
-        
-    if not all(isinstance(x, int) and 0 <= x <= 4 for x in responses):
-        raise ValueError("All responses must be integers between 0 and 4")
-        
-    return sum(responses)
+import numpy as np
+
+_DB_PATH = 'mental_health_checklist.db'
+
+# Single shared connection, reused across all calls and opened lazily by
+# _ensure_init on first database use
+_conn = None
+
+# Serializes access to the shared connection between the UI thread and
+# any background threads
+_db_lock = threading.Lock()
+
+# Cached query results keyed by SQL, dropped whenever a save touches
+# the table, so flipping graph filters doesn't re-run the SELECT each time
+_caches = {}
+
+# Score-to-level tables built once at import so lookups are a single
+# index instead of a chain of range comparisons
+_BURNS_LEVELS = []
+for _upper, _level in [(5, "No Depression"), (10, "Normal but unhappy"),
+                       (25, "Mild depression"), (50, "Moderate depression"),
+                       (75, "Severe depression"), (100, "Extreme depression")]:
+    _BURNS_LEVELS += [_level] * (_upper + 1 - len(_BURNS_LEVELS))
+
+_GAD7_LEVELS = []
+for _upper, _level in [(4, "Minimal anxiety"), (9, "Mild anxiety"),
+                       (14, "Moderate anxiety"), (21, "Severe anxiety")]:
+    _GAD7_LEVELS += [_level] * (_upper + 1 - len(_GAD7_LEVELS))
 
 def get_depression_level(score):
     """
     Return depression level based on total score
     """
-    if 0 <= score <= 5:
-        return "No Depression"
-    elif 6 <= score <= 10:
-        return "Normal but unhappy"
-    elif 11 <= score <= 25:
-        return "Mild depression"
-    elif 26 <= score <= 50:
-        return "Moderate depression"
-    elif 51 <= score <= 75:
-        return "Severe depression"
-    elif 76 <= score <= 100:
-        return "Extreme depression"
-    else:
-        return "Invalid score"
+    if 0 <= score <= 100:
+        return _BURNS_LEVELS[score]
+    return "Invalid score"
 
-def calculate_gad7_score(responses):
+def get_anxiety_level(score):
     """
-    Calculate total score from array of 7 responses
-    Each response should be between 0-3
+    Return anxiety level based on GAD-7 score
     """
-    if len(responses) != 7:
-        raise ValueError("Must provide exactly 7 responses")
-        
-    if not all(isinstance(x, int) and 0 <= x <= 3 for x in responses):
-        raise ValueError("All responses must be integers between 0 and 3")
-        
-    return sum(responses)
+    if 0 <= score <= 21:
+        return _GAD7_LEVELS[score]
+    return "Invalid score"
 
-def get_anxiety_level(score):
+@dataclass(frozen=True)
+class Questionnaire:
     """
-    Return anxiety level based on GAD-7 score
+    Static description of one questionnaire: its questions, response
+    scale, storage table, and how scores map to levels. Both the
+    scoring/saving functions and the GUI are driven from this, so the
+    Burns and GAD-7 code paths stay identical by construction.
+    """
+    name: str
+    table: str
+    level_column: str
+    questions: tuple
+    scale_label: str
+    max_response: int
+    level_fn: Callable
+    level_label: str
+    axis_label: str
+    max_score: int
+    tick_step: int
+
+BURNS = Questionnaire(
+    name="Burns Depression Checklist",
+    table='checklist_entries',
+    level_column='depression_level',
+    questions=(
+        "1. Feeling sad or down in the dumps", "2. Feeling unhappy or blue", "3. Crying spells or tearfulness",
+        "4.Feeling discouraged", "5.Feeling hopeless", "6.Low self-esteem", "7.Feeling worthless or inadequate",
+        "8.Guilt or shame", "9.Criticizing yourself or others", "10.Difficulty making decisions",
+        "11.Loss of interest in family, friends or colleagues", "12.Loneliness", "13.Spending less time with family or friends",
+        "14.Loss of motivation", "15.Loss of interest in work or other activities", "16.Avoiding work or other activities",
+        "17.Loss of pleasure or satisfaction in life", "18.Feeling tired", "19.Difficulty sleeping or sleeping too much",
+        "20.Decreased or increased appetite", "21.Loss of interest in sex", "22.Worrying about your health",
+        "23.Do you have any suicidal thoughts?", "24. Would you like to end your life?", "25. Do you have a plan for harming yourself?"
+    ),
+    scale_label="Rating Scale: 0=Not At All, 1=Somewhat, 2=Moderately, 3=A Lot, 4=Extremely",
+    max_response=4,
+    level_fn=get_depression_level,
+    level_label="Depression Level",
+    axis_label='Depression Score',
+    max_score=100,
+    tick_step=25,
+)
+
+GAD7 = Questionnaire(
+    name="GAD-7 Anxiety Questionnaire",
+    table='gad7_entries',
+    level_column='anxiety_level',
+    questions=(
+        "1. Feeling nervous, anxious, or on edge",
+        "2. Not being able to stop or control worrying",
+        "3. Worrying too much about different things",
+        "4. Trouble relaxing",
+        "5. Being so restless that it is hard to sit still",
+        "6. Becoming easily annoyed or irritable",
+        "7. Feeling afraid, as if something awful might happen"
+    ),
+    scale_label="Rating Scale: 0=Not at all, 1=Several days, 2=More than half the days, 3=Nearly every day",
+    max_response=3,
+    level_fn=get_anxiety_level,
+    level_label="Anxiety Level",
+    axis_label='Anxiety Score',
+    max_score=21,
+    tick_step=3,
+)
+
+# SQL built once per questionnaire at import so sqlite3's statement
+# cache always sees the identical string; the dicts double as the
+# whitelist of tables that may appear in generated SQL
+_INSERT_SQL = {q.table: (f'INSERT INTO {q.table} '
+                         f'(score, {q.level_column}, timestamp) VALUES (?, ?, ?)')
+               for q in (BURNS, GAD7)}
+_SELECT_SQL = {q.table: f'SELECT * FROM {q.table} ORDER BY timestamp DESC'
+               for q in (BURNS, GAD7)}
+_PLOT_SQL = {q.table: f'SELECT score, timestamp FROM {q.table} ORDER BY timestamp'
+             for q in (BURNS, GAD7)}
+
+def _ensure_init():
+    """
+    Open the shared connection and create tables on first use.
+    Opening a fresh connection per query pays file-open and
+    schema-lookup cost every time; WAL mode lets the UI thread keep
+    reading while a write is in flight. Doing this lazily keeps module
+    import cheap (e.g. under pytest or in worker processes).
+    """
+    global _conn
+    if _conn is None:
+        with _db_lock:
+            if _conn is None:
+                conn = sqlite3.connect(_DB_PATH, check_same_thread=False,
+                                       isolation_level=None, cached_statements=128)
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('PRAGMA synchronous=NORMAL')
+                conn.execute('PRAGMA temp_store=MEMORY')
+                conn.execute('''
+                CREATE TABLE IF NOT EXISTS checklist_entries
+                (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                 score INTEGER NOT NULL,
+                 depression_level TEXT NOT NULL,
+                 timestamp INTEGER NOT NULL DEFAULT (strftime('%s','now')))
+                ''')
+                conn.execute('''
+                CREATE TABLE IF NOT EXISTS gad7_entries
+                (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                 score INTEGER NOT NULL,
+                 anxiety_level TEXT NOT NULL,
+                 timestamp INTEGER NOT NULL DEFAULT (strftime('%s','now')))
+                ''')
+                # Covering indexes: the plot query reads only
+                # (timestamp, score), so it is answered straight from
+                # the index, already in order, with no sort step
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_checklist_ts_score '
+                             'ON checklist_entries(timestamp, score)')
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_gad7_ts_score '
+                             'ON gad7_entries(timestamp, score)')
+                _conn = conn
+    return _conn
+
+def _sql_for(questionnaire, statements):
+    try:
+        return statements[questionnaire.table]
+    except KeyError:
+        raise ValueError(f"Unknown table: {questionnaire.table}")
+
+def _drop_caches(table):
+    _caches.pop(_SELECT_SQL[table], None)
+    _caches.pop(_PLOT_SQL[table], None)
+
+def _cached_query(questionnaire, statements):
+    sql = _sql_for(questionnaire, statements)
+    conn = _ensure_init()
+    with _db_lock:
+        if sql not in _caches:
+            _caches[sql] = conn.execute(sql).fetchall()
+        return _caches[sql]
+
+def calculate_score(questionnaire, responses):
+    """
+    Calculate total score from an array of responses
+    Each response must be between 0 and the questionnaire's max
+    """
+    expected = len(questionnaire.questions)
+    if len(responses) != expected:
+        raise ValueError(f"Must provide exactly {expected} responses")
+
+    # One vectorized pass in C: the dtype check rejects floats and
+    # mixed input, then the bounds test and sum run without
+    # per-element Python dispatch. The GUI's array('b') buffers
+    # convert without copying.
+    values = np.asarray(responses)
+    if (values.dtype.kind not in 'bui'
+            or not ((values >= 0) & (values <= questionnaire.max_response)).all()):
+        raise ValueError("All responses must be integers between 0 "
+                         f"and {questionnaire.max_response}")
+
+    return int(values.sum())
+
+def save(questionnaire, score):
+    """
+    Save a score to the questionnaire's table with current timestamp
+    Returns the entry ID
+    """
+    level = questionnaire.level_fn(score)
+    current_time = int(datetime.now().timestamp())
+    conn = _ensure_init()
+
+    with _db_lock:
+        _drop_caches(questionnaire.table)
+        cursor = conn.execute(_sql_for(questionnaire, _INSERT_SQL),
+                              (score, level, current_time))
+        return cursor.lastrowid
+
+def save_bulk(questionnaire, scores):
+    """
+    Save several scores in a single transaction
+    Much cheaper than calling save per entry when importing history
+    """
+    now = int(datetime.now().timestamp())
+    rows = [(score, questionnaire.level_fn(score), now) for score in scores]
+    conn = _ensure_init()
+
+    with _db_lock:
+        _drop_caches(questionnaire.table)
+        conn.execute('BEGIN')
+        conn.executemany(_sql_for(questionnaire, _INSERT_SQL), rows)
+        conn.execute('COMMIT')
+
+def get_entries(questionnaire):
+    """
+    Retrieve all entries for a questionnaire, newest first
+    """
+    return _cached_query(questionnaire, _SELECT_SQL)
+
+def get_plot_entries(questionnaire):
     """
-    if 0 <= score <= 4:
-        return "Minimal anxiety"
-    elif 5 <= score <= 9:
-        return "Mild anxiety"
-    elif 10 <= score <= 14:
-        return "Moderate anxiety"
-    elif 15 <= score <= 21:
-        return "Severe anxiety"
-    else:
-        return "Invalid score"
+    Retrieve (score, timestamp) pairs for a questionnaire in
+    timestamp order — only what the graph needs, answered entirely
+    from the covering index
+    """
+    return _cached_query(questionnaire, _PLOT_SQL)
 
 def init_db():
     """
     Initialize SQLite database and create tables if they don't exist
     """
-    conn = sqlite3.connect('mental_health_checklist.db')
-    c = conn.cursor()
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS checklist_entries
-        (id INTEGER PRIMARY KEY AUTOINCREMENT,
-         score INTEGER NOT NULL,
-         depression_level TEXT NOT NULL,
-         timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)
-    ''')
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS gad7_entries
-        (id INTEGER PRIMARY KEY AUTOINCREMENT,
-         score INTEGER NOT NULL,
-         anxiety_level TEXT NOT NULL,
-         timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)
-    ''')
-    conn.commit()
-    conn.close()
+    _ensure_init()
 
-def save_score(score):
+# Named helpers kept so existing callers (and the demo below) keep working
+
+def calculate_burns_score(responses):
     """
-    Save Burns score to database with current timestamp
-    Returns the entry ID
+    Calculate total score from array of 25 responses
     """
-    conn = sqlite3.connect('mental_health_checklist.db')
-    c = conn.cursor()
-    
-    depression_level = get_depression_level(score)
-    current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    
-    c.execute('''
-        INSERT INTO checklist_entries (score, depression_level, timestamp)
-        VALUES (?, ?, ?)
-    ''', (score, depression_level, current_time))
-    
-    entry_id = c.lastrowid
-    conn.commit()
-    conn.close()
-    
-    return entry_id
+    return calculate_score(BURNS, responses)
 
-def get_all_entries():
+def calculate_gad7_score(responses):
     """
-    Retrieve all Burns entries from database
+    Calculate total score from array of 7 responses
     """
-    conn = sqlite3.connect('mental_health_checklist.db')
-    c = conn.cursor()
-    c.execute('SELECT * FROM checklist_entries ORDER BY timestamp DESC')
-    entries = c.fetchall()
-    conn.close()
-    return entries
+    return calculate_score(GAD7, responses)
+
+def save_score(score):
+    """
+    Save Burns score to database, returns the entry ID
+    """
+    return save(BURNS, score)
 
 def save_gad7_score(score):
     """
-    Save GAD-7 score to database with current timestamp
-    Returns the entry ID
+    Save GAD-7 score to database, returns the entry ID
     """
-    conn = sqlite3.connect('mental_health_checklist.db')
-    c = conn.cursor()
-    
-    anxiety_level = get_anxiety_level(score)
-    current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    
-    c.execute('''
-        INSERT INTO gad7_entries (score, anxiety_level, timestamp)
-        VALUES (?, ?, ?)
-    ''', (score, anxiety_level, current_time))
-    
-    entry_id = c.lastrowid
-    conn.commit()
-    conn.close()
-    
-    return entry_id
+    return save(GAD7, score)
+
+def save_scores_bulk(scores):
+    """
+    Save several Burns scores in a single transaction
+    """
+    save_bulk(BURNS, scores)
+
+def save_gad7_scores_bulk(scores):
+    """
+    Save several GAD-7 scores in a single transaction
+    """
+    save_bulk(GAD7, scores)
+
+def get_all_entries():
+    """
+    Retrieve all Burns entries from database
+    """
+    return get_entries(BURNS)
 
 def get_all_gad7_entries():
     """
     Retrieve all GAD-7 entries from database
     """
-    conn = sqlite3.connect('mental_health_checklist.db')
-    c = conn.cursor()
-    c.execute('SELECT * FROM gad7_entries ORDER BY timestamp DESC')
-    entries = c.fetchall()
-    conn.close()
-    return entries
-
-# Initialize database when module is imported
-init_db()
+    return get_entries(GAD7)
 
 # Example usage:
 if __name__ == "__main__":
     # Example Burns checklist responses
-    sample_burns_responses = [2, 1, 0, 2, 1, 3, 2, 1, 0, 2, 1, 0, 2, 1, 3, 
+    sample_burns_responses = [2, 1, 0, 2, 1, 3, 2, 1, 0, 2, 1, 0, 2, 1, 3,
                               2, 1, 0, 2, 1, 0, 2, 1, 0, 0]
-    
+
     # Calculate Burns score
     burns_score = calculate_burns_score(sample_burns_responses)
     print(f"Total Burns Score: {burns_score}")
     print(f"Depression Level: {get_depression_level(burns_score)}")
-    
+
     # Save Burns score to database
     burns_entry_id = save_score(burns_score)
     print(f"Saved Burns entry with ID: {burns_entry_id}")
-    
+
     # Retrieve all Burns entries
     burns_entries = get_all_entries()
     print("\nAll Burns entries:")
-    for entry in burns_entries:
-        print(f"ID: {entry[0]}, Score: {entry[1]}, Level: {entry[2]}, Time: {entry[3]}")
-        
+    sys.stdout.write('\n'.join(f"ID: {e[0]}, Score: {e[1]}, Level: {e[2]}, Time: {e[3]}"
+                               for e in burns_entries) + '\n')
+
     print("-" * 20)
 
     # Example GAD-7 responses
     sample_gad7_responses = [1, 2, 3, 2, 1, 0, 1]
-    
+
     # Calculate GAD-7 score
     gad7_score = calculate_gad7_score(sample_gad7_responses)
     print(f"Total GAD-7 Score: {gad7_score}")
     print(f"Anxiety Level: {get_anxiety_level(gad7_score)}")
-    
+
     # Save GAD-7 score to database
     gad7_entry_id = save_gad7_score(gad7_score)
     print(f"Saved GAD-7 entry with ID: {gad7_entry_id}")
-    
+
     # Retrieve all GAD-7 entries
     gad7_entries = get_all_gad7_entries()
     print("\nAll GAD-7 entries:")
-    for entry in gad7_entries:
-        print(f"ID: {entry[0]}, Score: {entry[1]}, Level: {entry[2]}, Time: {entry[3]}")
+    sys.stdout.write('\n'.join(f"ID: {e[0]}, Score: {e[1]}, Level: {e[2]}, Time: {e[3]}"
+                               for e in gad7_entries) + '\n')
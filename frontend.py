@@ -1,104 +1,86 @@
-from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
-                            QHBoxLayout, QLabel, QSpinBox, QPushButton, 
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
+                            QHBoxLayout, QLabel, QSpinBox, QPushButton,
                             QScrollArea, QComboBox, QDateTimeEdit, QStackedWidget)
-from PyQt5.QtCore import Qt, QDateTime
+from PyQt5.QtCore import Qt, QDateTime, QObject, QRunnable, QThreadPool, pyqtSignal
 import sys
+import numpy as np
 import pyqtgraph as pg
-from backend import (calculate_burns_score, save_score, get_all_entries, get_depression_level,
-                     calculate_gad7_score, save_gad7_score, get_all_gad7_entries, get_anxiety_level)
+from backend import BURNS, GAD7, calculate_score, save, get_plot_entries
 
+from array import array
 from datetime import datetime, timedelta
 
+# Order matches both combo boxes
+QUESTIONNAIRES = (BURNS, GAD7)
+
+class WorkerSignals(QObject):
+    finished = pyqtSignal(object)
+
+class DbWorker(QRunnable):
+    """
+    Runs a backend function on the thread pool so database I/O
+    never blocks the Qt event loop
+    """
+    def __init__(self, fn, *args):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.signals = WorkerSignals()
+
+    def run(self):
+        self.signals.finished.emit(self.fn(*self.args))
+
 class MentalHealthTracker(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Mental Health Tracker")
         self.setMinimumSize(800, 600)
-        
+
+        # Dedicated single-thread pool: all DB work runs on one worker
+        # in submission order, like aiosqlite's worker-thread model,
+        # so queries never contend for the connection lock
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+
+        # Per-questionnaire widgets and live score arrays, filled in by
+        # create_questionnaire
+        self._score_arrays = {}
+        self._result_labels = {}
+
         # Create main widget and layout
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
         self.layout = QVBoxLayout(self.central_widget)
-        
+
         # Questionnaire selection
         self.questionnaire_select = QComboBox()
-        self.questionnaire_select.addItems(["Burns Depression Checklist", "GAD-7 Anxiety Questionnaire"])
+        self.questionnaire_select.addItems([q.name for q in QUESTIONNAIRES])
         self.questionnaire_select.currentIndexChanged.connect(self.switch_questionnaire)
         self.layout.addWidget(self.questionnaire_select)
 
         # Create stacked widget for questionnaires
         self.questionnaire_stack = QStackedWidget()
-        self.burns_widget = self.create_burns_questionnaire()
-        self.gad7_widget = self.create_gad7_questionnaire()
-        self.questionnaire_stack.addWidget(self.burns_widget)
-        self.questionnaire_stack.addWidget(self.gad7_widget)
-        
+        for questionnaire in QUESTIONNAIRES:
+            self.questionnaire_stack.addWidget(self.create_questionnaire(questionnaire))
+
         self.graph_widget = self.create_graph()
-        
+
         # Add both widgets to main layout
         self.layout.addWidget(self.questionnaire_stack)
         self.layout.addWidget(self.graph_widget)
-        
+
         # Toggle button at the bottom
         self.toggle_button = QPushButton("Switch to Graph View")
         self.toggle_button.clicked.connect(self.toggle_view)
         self.layout.addWidget(self.toggle_button)
-        
+
         # Initially hide the graph
         self.graph_widget.hide()
 
     def switch_questionnaire(self, index):
         self.questionnaire_stack.setCurrentIndex(index)
-        
-    def create_burns_questionnaire(self):
-        widget = QWidget()
-        layout = QVBoxLayout(widget)
-        
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll_widget = QWidget()
-        scroll_layout = QVBoxLayout(scroll_widget)
-        
-        self.burns_responses = []
-        questions = [
-            "1. Feeling sad or down in the dumps", "2. Feeling unhappy or blue", "3. Crying spells or tearfulness",
-            "4.Feeling discouraged", "5.Feeling hopeless", "6.Low self-esteem", "7.Feeling worthless or inadequate",
-            "8.Guilt or shame", "9.Criticizing yourself or others", "10.Difficulty making decisions",
-            "11.Loss of interest in family, friends or colleagues", "12.Loneliness", "13.Spending less time with family or friends",
-            "14.Loss of motivation", "15.Loss of interest in work or other activities", "16.Avoiding work or other activities",
-            "17.Loss of pleasure or satisfaction in life", "18.Feeling tired", "19.Difficulty sleeping or sleeping too much",
-            "20.Decreased or increased appetite", "21.Loss of interest in sex", "22.Worrying about your health",
-            "23.Do you have any suicidal thoughts?", "24. Would you like to end your life?", "25. Do you have a plan for harming yourself?"
-        ]
-        
-        scale_label = QLabel("Rating Scale: 0=Not At All, 1=Somewhat, 2=Moderately, 3=A Lot, 4=Extremely")
-        scroll_layout.addWidget(scale_label)
-        
-        for question in questions:
-            q_widget = QWidget()
-            q_layout = QHBoxLayout(q_widget)
-            label = QLabel(question)
-            label.setWordWrap(True)
-            spinbox = QSpinBox()
-            spinbox.setRange(0, 4)
-            q_layout.addWidget(label)
-            q_layout.addWidget(spinbox)
-            self.burns_responses.append(spinbox)
-            scroll_layout.addWidget(q_widget)
-        
-        scroll.setWidget(scroll_widget)
-        layout.addWidget(scroll)
-        
-        submit_btn = QPushButton("Calculate Score")
-        submit_btn.clicked.connect(self.calculate_burns_result)
-        layout.addWidget(submit_btn)
-        
-        self.burns_result_label = QLabel()
-        layout.addWidget(self.burns_result_label)
-        
-        return widget
 
-    def create_gad7_questionnaire(self):
+    def create_questionnaire(self, questionnaire):
         widget = QWidget()
         layout = QVBoxLayout(widget)
 
@@ -107,48 +89,44 @@ class MentalHealthTracker(QMainWindow):
         scroll_widget = QWidget()
         scroll_layout = QVBoxLayout(scroll_widget)
 
-        self.gad7_responses = []
-        questions = [
-            "1. Feeling nervous, anxious, or on edge",
-            "2. Not being able to stop or control worrying",
-            "3. Worrying too much about different things",
-            "4. Trouble relaxing",
-            "5. Being so restless that it is hard to sit still",
-            "6. Becoming easily annoyed or irritable",
-            "7. Feeling afraid, as if something awful might happen"
-        ]
-
-        scale_label = QLabel("Rating Scale: 0=Not at all, 1=Several days, 2=More than half the days, 3=Nearly every day")
-        scroll_layout.addWidget(scale_label)
-
-        for question in questions:
+        # Live copy of the spinbox values, updated by valueChanged
+        # signals so the submit handler doesn't poll every widget
+        scores = array('b', [0] * len(questionnaire.questions))
+        self._score_arrays[questionnaire] = scores
+
+        scroll_layout.addWidget(QLabel(questionnaire.scale_label))
+
+        for i, question in enumerate(questionnaire.questions):
             q_widget = QWidget()
             q_layout = QHBoxLayout(q_widget)
             label = QLabel(question)
             label.setWordWrap(True)
             spinbox = QSpinBox()
-            spinbox.setRange(0, 3)
+            spinbox.setRange(0, questionnaire.max_response)
+            spinbox.valueChanged.connect(
+                lambda value, i=i, scores=scores: scores.__setitem__(i, value))
             q_layout.addWidget(label)
             q_layout.addWidget(spinbox)
-            self.gad7_responses.append(spinbox)
             scroll_layout.addWidget(q_widget)
 
         scroll.setWidget(scroll_widget)
         layout.addWidget(scroll)
 
         submit_btn = QPushButton("Calculate Score")
-        submit_btn.clicked.connect(self.calculate_gad7_result)
+        submit_btn.clicked.connect(
+            lambda _, q=questionnaire: self.calculate_result(q))
         layout.addWidget(submit_btn)
 
-        self.gad7_result_label = QLabel()
-        layout.addWidget(self.gad7_result_label)
+        result_label = QLabel()
+        self._result_labels[questionnaire] = result_label
+        layout.addWidget(result_label)
 
         return widget
-        
+
     def create_graph(self):
         widget = QWidget()
         layout = QVBoxLayout(widget)
-        
+
         controls_widget = QWidget()
         controls_layout = QHBoxLayout(controls_widget)
 
@@ -161,100 +139,124 @@ class MentalHealthTracker(QMainWindow):
         self.time_filter = QComboBox()
         self.time_filter.addItems(["All Time", "Last Week", "Last Month", "Last Year", "Custom"])
         self.time_filter.currentTextChanged.connect(self.update_graph)
-        
+
         self.date_from = QDateTimeEdit()
         self.date_to = QDateTimeEdit()
         self.date_from.setDateTime(QDateTime.currentDateTime().addDays(-7))
         self.date_to.setDateTime(QDateTime.currentDateTime())
-        
+
         controls_layout.addWidget(QLabel("Time Range:"))
         controls_layout.addWidget(self.time_filter)
         controls_layout.addWidget(QLabel("From:"))
         controls_layout.addWidget(self.date_from)
         controls_layout.addWidget(QLabel("To:"))
         controls_layout.addWidget(self.date_to)
-        
+
         layout.addWidget(controls_widget)
-        
+
         self.graph = pg.PlotWidget()
         self.graph.setBackground('w')
         self.graph.setLabel('bottom', 'Date')
-        
+
         self.graph.showGrid(x=True, y=True)
         self.graph.setMouseEnabled(x=False, y=False)
         self.graph.setMenuEnabled(False)
-        
+        # Keep rendering cost proportional to pixels, not DB rows
+        self.graph.setDownsampling(auto=True, mode='peak')
+        self.graph.setClipToView(True)
+
         date_axis = pg.DateAxisItem(orientation='bottom')
         self.graph.setAxisItems({'bottom': date_axis})
-        
+
+        # Tick sets are fixed per questionnaire, so build them once and
+        # only touch the axis when the selection actually changes
+        self._ticks = {q: [[(i, str(i)) for i in range(0, q.max_score + 1, q.tick_step)]]
+                       for q in QUESTIONNAIRES}
+        self._last_graph_q = None
+
+        # One persistent curve, updated in place; recreating the plot
+        # item on each refresh churned Qt's scene graph
+        self.curve = self.graph.plot([], [],
+                                     symbol='o',
+                                     symbolSize=10,
+                                     symbolBrush='b',
+                                     pen=pg.mkPen('b', width=2))
+
         layout.addWidget(self.graph)
         return widget
 
-    def calculate_burns_result(self):
-        scores = [spin.value() for spin in self.burns_responses]
-        total_score = calculate_burns_score(scores)
-        save_score(total_score)
-        
-        self.burns_result_label.setText(f"Your total score is: {total_score}\n"
-                                     f"Depression Level: {get_depression_level(total_score)}")
-        
-    def calculate_gad7_result(self):
-        scores = [spin.value() for spin in self.gad7_responses]
-        total_score = calculate_gad7_score(scores)
-        save_gad7_score(total_score)
-        
-        self.gad7_result_label.setText(f"Your total score is: {total_score}\n"
-                                    f"Anxiety Level: {get_anxiety_level(total_score)}")
-        
+    def calculate_result(self, questionnaire):
+        total_score = calculate_score(questionnaire, self._score_arrays[questionnaire])
+        worker = DbWorker(save, questionnaire, total_score)
+        worker.signals.finished.connect(
+            lambda _: self.show_result(questionnaire, total_score))
+        self.pool.start(worker)
+
+    def show_result(self, questionnaire, total_score):
+        self._result_labels[questionnaire].setText(
+            f"Your total score is: {total_score}\n"
+            f"{questionnaire.level_label}: {questionnaire.level_fn(total_score)}")
+
     def update_graph(self):
-        graph_type = self.graph_select.currentText()
-        
-        if "Depression" in graph_type:
-            entries = get_all_entries()
-            self.graph.setLabel('left', 'Depression Score')
-            self.graph.setYRange(0, 100, padding=0)
-            y_axis = self.graph.getAxis('left')
-            y_ticks = [(i, str(i)) for i in range(0, 101, 25)]
-            y_axis.setTicks([y_ticks])
-        else:
-            entries = get_all_gad7_entries()
-            self.graph.setLabel('left', 'Anxiety Score')
-            self.graph.setYRange(0, 21, padding=0)
-            y_axis = self.graph.getAxis('left')
-            y_ticks = [(i, str(i)) for i in range(0, 22, 3)]
-            y_axis.setTicks([y_ticks])
+        questionnaire = QUESTIONNAIRES[self.graph_select.currentIndex()]
+
+        if self._last_graph_q is not questionnaire:
+            self._last_graph_q = questionnaire
+            self.graph.setLabel('left', questionnaire.axis_label)
+            self.graph.setYRange(0, questionnaire.max_score, padding=0)
+            self.graph.getAxis('left').setTicks(self._ticks[questionnaire])
+
+        # Widgets are read here on the UI thread; the query, filter,
+        # and array building all happen on the worker, so the only
+        # UI-thread work left is the final setData call
+        bounds = self.filter_bounds()
+        worker = DbWorker(self.fetch_plot_data, questionnaire, bounds)
+        worker.signals.finished.connect(self.apply_graph_data)
+        self.pool.start(worker)
 
+    def filter_bounds(self):
+        """
+        Return the selected time range as (lo, hi) epoch seconds,
+        or None for All Time so the filter can be skipped entirely
+        """
         filter_type = self.time_filter.currentText()
+        if filter_type == "All Time":
+            return None
         now = datetime.now()
-        
+
         if filter_type == "Last Week":
             start_date = now - timedelta(days=7)
         elif filter_type == "Last Month":
             start_date = now - timedelta(days=30)
         elif filter_type == "Last Year":
             start_date = now - timedelta(days=365)
-        elif filter_type == "Custom":
+        else:  # Custom
             start_date = self.date_from.dateTime().toPyDateTime()
             now = self.date_to.dateTime().toPyDateTime()
-        else:  # All Time
-            start_date = datetime.min
-        
-        filtered_entries = [(entry[1], datetime.strptime(entry[3], '%Y-%m-%d %H:%M:%S'))
-                        for entry in entries
-                        if datetime.strptime(entry[3], '%Y-%m-%d %H:%M:%S') >= start_date
-                        and datetime.strptime(entry[3], '%Y-%m-%d %H:%M:%S') <= now]
-        
-        self.graph.clear()
-        if filtered_entries:
-            scores, dates = zip(*filtered_entries)
-            timestamps = [d.timestamp() for d in dates]
-            
-            self.graph.plot(timestamps, scores, 
-                        symbol='o',
-                        symbolSize=10,
-                        symbolBrush='b',
-                        pen=pg.mkPen('b', width=2))
-            
+
+        return start_date.timestamp(), now.timestamp()
+
+    @staticmethod
+    def fetch_plot_data(questionnaire, bounds):
+        entries = get_plot_entries(questionnaire)
+        if bounds is None:
+            filtered_entries = entries
+        else:
+            lo, hi = bounds
+            filtered_entries = [entry for entry in entries
+                                if lo <= entry[1] <= hi]
+
+        count = len(filtered_entries)
+        timestamps = np.fromiter((ts for _, ts in filtered_entries),
+                                 dtype=np.float64, count=count)
+        scores = np.fromiter((score for score, _ in filtered_entries),
+                             dtype=np.int16, count=count)
+        return timestamps, scores
+
+    def apply_graph_data(self, data):
+        timestamps, scores = data
+        self.curve.setData(timestamps, scores)
+
     def toggle_view(self):
         if self.questionnaire_stack.isVisible():
             self.questionnaire_stack.hide()